@@ -0,0 +1,167 @@
+"""Frame-loop allocation benchmark (decode -> anonymize -> subtitle -> encode).
+
+The default mode runs ``output.video_writer.write_video`` itself; ``--no-pool``
+runs the previous allocating loop from ``tests/legacy_frame_loop.py`` (plain
+``cap.read()``, ``cvtColor`` / ``GaussianBlur`` returning new arrays, full-frame
+subtitle overlay) for comparison. Per loop iteration it reports the peak
+numpy-visible bytes allocated above the iteration's baseline (tracemalloc
+exposes byte totals only, not an allocation count). OpenCV-internal temporaries
+allocated with ``cv::fastMalloc`` (the ``detectMultiScale`` image pyramid,
+``GaussianBlur`` intermediates, codec buffers) are not counted. It also reports
+the process peak RSS (peak working set on Windows). Run one mode per process,
+since peak RSS is a process-wide high-water mark:
+
+    python -m benchmarks.frame_loop --input demo/cursorful-video-1754726632749_half.mp4
+    python -m benchmarks.frame_loop --input demo/cursorful-video-1754726632749_half.mp4 --no-pool
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from output.video_writer import write_video
+from tests.legacy_frame_loop import LegacyFaceAnonymizer, legacy_write_video
+from video_processor import FaceAnonymizer
+
+
+def parse_args():
+    p = argparse.ArgumentParser("Frame loop benchmark")
+    p.add_argument("--input", type=str, required=True, help="Path to input video file")
+    p.add_argument("--frames", type=int, default=120, help="Frames to benchmark (0 = whole input)")
+    p.add_argument("--blur-method", type=str, default="gaussian", choices=["gaussian", "pixelate"])
+    p.add_argument("--subtitle", type=str, default="benchmark caption", help="Overlay text ('' disables)")
+    p.add_argument("--no-pool", action="store_true", help="Run the previous allocating frame loop")
+    return p.parse_args()
+
+
+def peak_rss_mb() -> float:
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        kernel32 = ctypes.WinDLL("kernel32")
+        psapi = ctypes.WinDLL("psapi")
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [
+            wintypes.HANDLE,
+            ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+            wintypes.DWORD,
+        ]
+        psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            raise ctypes.WinError()
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class _MeteredAnonymizer:
+    """Delegating anonymizer that records peak numpy-visible bytes per loop iteration.
+
+    ``anonymize`` is called once per frame, so the span between two calls is one
+    full iteration: anonymize, subtitle, encode, then decode of the next frame.
+    """
+
+    def __init__(self, anonymizer):
+        self.anonymizer = anonymizer
+        self.per_frame = []
+        self._base = None
+
+    def anonymize(self, frame):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._base is not None:
+            self.per_frame.append(peak - self._base)
+        tracemalloc.reset_peak()
+        self._base = current
+        return self.anonymizer.anonymize(frame)
+
+
+def _trim(input_path, out_path, frames):
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {input_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25
+    writer = None
+    for _ in range(frames):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if writer is None:
+            h, w = frame.shape[:2]
+            writer = cv2.VideoWriter(out_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+        writer.write(frame)
+    cap.release()
+    if writer is None:
+        raise RuntimeError("No frames decoded")
+    writer.release()
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = args.input
+        if args.frames > 0:
+            # Benchmark a short clip so both modes see the same frames
+            input_path = os.path.join(tmp, "clip.mp4")
+            _trim(args.input, input_path, args.frames)
+        out_path = os.path.join(tmp, "bench.mp4")
+
+        cap = cv2.VideoCapture(input_path)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+
+        anonymizer_cls = LegacyFaceAnonymizer if args.no_pool else FaceAnonymizer
+        metered = _MeteredAnonymizer(anonymizer_cls(blur_method=args.blur_method))
+
+        tracemalloc.start()
+        segments = [{"start": 0.0, "end": float("inf"), "text": args.subtitle}] if args.subtitle else None
+        start = time.perf_counter()
+        if args.no_pool:
+            legacy_write_video(input_path, out_path, metered, subtitle_segments=segments)
+        else:
+            write_video(input_path, out_path, metered, subtitle_segments=segments)
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+
+    per_frame = metered.per_frame
+    if not per_frame:
+        raise RuntimeError("Need at least two frames")
+    n = len(per_frame) + 1
+    # Skip the first iteration: it sizes the pool and scratch buffers
+    steady = per_frame[1:] or per_frame
+    print(f"mode: {'legacy (allocating)' if args.no_pool else 'pooled (write_video)'}  frames: {n}  {width}x{height}  fps: {n / elapsed:.1f}")
+    print(
+        f"peak numpy-visible bytes/frame: mean {np.mean(steady) / 1024:.1f} KiB, max {max(steady) / 1024:.1f} KiB "
+        "(OpenCV-internal temporaries not counted)"
+    )
+    print(f"frames allocating a full frame: {sum(b >= width * height * 3 for b in steady)}/{len(steady)}")
+    print(f"peak RSS: {peak_rss_mb():.1f} MiB")
+
+
+if __name__ == "__main__":
+    run(parse_args())
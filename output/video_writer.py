@@ -5,12 +5,18 @@ import numpy as np
 from loguru import logger
 import shutil
 import subprocess
+import threading
+
+from utils.buffers import FramePool, scratch_view
 
 try:
     import imageio_ffmpeg  # optional fallback
 except Exception:  # pragma: no cover
     imageio_ffmpeg = None
 
+# Per-thread backing buffer for the subtitle box blend, grown on demand and reused
+_subtitle_scratch = threading.local()
+
 
 def _resolve_ffmpeg_exe() -> Optional[str]:
     exe = shutil.which("ffmpeg")
@@ -41,14 +47,29 @@ def _attempt_fix_container(input_path: str) -> Optional[str]:
     return None
 
 
-def put_subtitle(frame, text: str, pos=(30, 40), font_scale=0.7, color=(255, 255, 255), bg_color=(0, 0, 0)):
+def put_subtitle(
+    frame,
+    text: str,
+    pos=(30, 40),
+    font_scale=0.7,
+    color=(255, 255, 255),
+    bg_color=(0, 0, 0),
+):
     if not text:
         return frame
-    overlay = frame.copy()
     (w, h), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 2)
     x, y = pos
-    cv2.rectangle(overlay, (x-10, y-25), (x + w + 10, y + 10), bg_color, -1)
-    cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
+    # Only the background box differs from the frame, so blend just that region
+    # (clipped to the frame) through a scratch copy instead of the whole frame.
+    fh, fw = frame.shape[:2]
+    x0, y0 = max(0, x - 10), max(0, y - 25)
+    x1, y1 = min(fw, x + w + 11), min(fh, y + 11)
+    if x0 < x1 and y0 < y1:
+        region = frame[y0:y1, x0:x1]
+        _subtitle_scratch.buf, overlay = scratch_view(getattr(_subtitle_scratch, "buf", None), region.shape)
+        np.copyto(overlay, region)
+        cv2.rectangle(overlay, (x - 10 - x0, y - 25 - y0), (x + w + 10 - x0, y + 10 - y0), bg_color, -1)
+        cv2.addWeighted(overlay, 0.5, region, 0.5, 0, dst=region)
     cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, 2, cv2.LINE_AA)
     return frame
 
@@ -86,13 +107,26 @@ def write_video(
     fourcc = cv2.VideoWriter_fourcc(*"mp4v")
     writer = cv2.VideoWriter(out_path, fourcc, fps, (width, height))
 
+    # Decode into pooled buffers and hand them back after encode, so the loop
+    # does not allocate a fresh frame (or subtitle overlay) per iteration.
+    # Capture props can be 0x0 (some webcams); the pool is then sized from the first frame.
+    pool = FramePool((height, width, 3), size=1) if width > 0 and height > 0 else None
+
     seg_idx = 0
     cur_sub = ""
 
     while True:
-        ret, frame = cap.read()
+        buf = pool.acquire() if pool is not None else None
+        ret, frame = cap.read(image=buf) if buf is not None else cap.read()
         if not ret:
             break
+        if frame is not buf:
+            # Decoder output differs from the reported size (e.g. auto-rotated video);
+            # resize the pool once so later frames are pooled again
+            expected = pool.shape if pool is not None else (height, width, 3)
+            logger.warning(f"Decoded frame shape {frame.shape} differs from expected {expected}; resizing frame pool")
+            pool = FramePool(frame.shape, size=1)
+            buf = None
         frame = anonymizer.anonymize(frame)
 
         if subtitle_segments:
@@ -111,6 +145,9 @@ def write_video(
             frame = put_subtitle(frame, cur_sub)
 
         writer.write(frame)
+        # Return the acquired buffer, not `frame`: the anonymizer may hand back a new array
+        if buf is not None:
+            pool.release(buf)
         if display:
             cv2.imshow("Anonymized", frame)
             if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -118,5 +155,6 @@ def write_video(
 
     cap.release()
     writer.release()
-    cv2.destroyAllWindows()
+    if display:
+        cv2.destroyAllWindows()
     logger.info(f"Saved video: {out_path}")
@@ -0,0 +1,94 @@
+"""Frame path as it was before buffer reuse (allocating reference).
+
+The in-place path must match this bit for bit; tests compare against it and
+``benchmarks.frame_loop --no-pool`` runs it as the allocation baseline.
+"""
+from typing import Dict, List, Optional
+
+import cv2
+
+from video_processor.face_blur import FaceAnonymizer
+
+
+class LegacyFaceAnonymizer(FaceAnonymizer):
+    def detect_faces(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        rects = self.detector.detectMultiScale(
+            gray,
+            scaleFactor=self.scale_factor,
+            minNeighbors=self.min_neighbors,
+            minSize=self.min_size,
+            flags=cv2.CASCADE_SCALE_IMAGE,
+        )
+        return [(x, y, w, h) for (x, y, w, h) in rects]
+
+    def _blur_roi(self, roi):
+        if self.blur_method == "gaussian":
+            return cv2.GaussianBlur(roi, self.gaussian_kernel, self.gaussian_sigma)
+        elif self.blur_method == "pixelate":
+            h, w = roi.shape[:2]
+            x_blocks = max(1, self.pixelate_blocks)
+            roi_small = cv2.resize(roi, (x_blocks, max(1, int(x_blocks * h / w))), interpolation=cv2.INTER_LINEAR)
+            return cv2.resize(roi_small, (w, h), interpolation=cv2.INTER_NEAREST)
+        else:
+            raise ValueError(f"Unknown blur method: {self.blur_method}")
+
+    def anonymize(self, frame):
+        faces = self.detect_faces(frame)
+        for (x, y, w, h) in faces:
+            roi = frame[y : y + h, x : x + w]
+            frame[y : y + h, x : x + w] = self._blur_roi(roi)
+        return frame
+
+
+def legacy_put_subtitle(frame, text: str, pos=(30, 40), font_scale=0.7, color=(255, 255, 255), bg_color=(0, 0, 0)):
+    if not text:
+        return frame
+    overlay = frame.copy()
+    (w, h), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 2)
+    x, y = pos
+    cv2.rectangle(overlay, (x-10, y-25), (x + w + 10, y + 10), bg_color, -1)
+    cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
+    cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, 2, cv2.LINE_AA)
+    return frame
+
+
+def legacy_write_video(input_path: str, out_path: str, anonymizer, subtitle_segments: Optional[List[Dict]] = None):
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {input_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    writer = cv2.VideoWriter(out_path, fourcc, fps, (width, height))
+
+    seg_idx = 0
+    cur_sub = ""
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame = anonymizer.anonymize(frame)
+
+        if subtitle_segments:
+            t = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            # Advance segment pointer
+            while seg_idx < len(subtitle_segments) and subtitle_segments[seg_idx]["end"] < t:
+                seg_idx += 1
+            if seg_idx < len(subtitle_segments):
+                seg = subtitle_segments[seg_idx]
+                if seg["start"] <= t <= seg["end"]:
+                    cur_sub = seg["text"]
+                else:
+                    cur_sub = ""
+            else:
+                cur_sub = ""
+            frame = legacy_put_subtitle(frame, cur_sub)
+
+        writer.write(frame)
+
+    cap.release()
+    writer.release()
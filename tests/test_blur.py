@@ -1,6 +1,8 @@
+import threading
 import numpy as np
 import cv2
 from video_processor.face_blur import FaceAnonymizer
+from tests.legacy_frame_loop import LegacyFaceAnonymizer
 
 
 def _make_roi_with_detail(img_size=100, square_top_left=(30, 30), square_size=40):
@@ -28,3 +30,51 @@ def test_pixelate_blur_changes_pixels():
     roi = _make_roi_with_detail()
     pixelated = anonymizer._blur_roi(roi)
     assert np.any(pixelated != roi)
+
+
+def test_inplace_blur_matches_legacy_output():
+    rng = np.random.default_rng(0)
+    for method in ("gaussian", "pixelate"):
+        anonymizer = FaceAnonymizer(blur_method=method, pixelate_blocks=7)
+        legacy = LegacyFaceAnonymizer(blur_method=method, pixelate_blocks=7)
+        # Varying ROI sizes exercise scratch reuse and growth
+        for size in ((40, 40), (25, 60), (90, 33), (40, 40)):
+            frame = rng.integers(0, 256, (120, 140, 3), dtype=np.uint8)
+            roi = frame[10 : 10 + size[0], 20 : 20 + size[1]]
+            expected = legacy._blur_roi(roi)
+            assert np.array_equal(anonymizer._blur_roi(roi), expected)
+
+
+def test_anonymize_reuses_buffers_across_frames():
+    anonymizer = FaceAnonymizer(blur_method="gaussian")
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    anonymizer.detect_faces(frame)
+    gray = anonymizer._scratch.gray
+    out = anonymizer.anonymize(frame)
+    assert out is frame
+    assert anonymizer._scratch.gray is gray
+
+
+def test_shared_anonymizer_is_thread_safe():
+    # One cached instance serves several streams in app.py, each on its own thread
+    anonymizer = FaceAnonymizer(blur_method="gaussian")
+    rng = np.random.default_rng(0)
+    rois = [rng.integers(0, 256, (60, 50, 3), dtype=np.uint8) for _ in range(4)]
+    legacy = LegacyFaceAnonymizer(blur_method="gaussian")
+    expected = [legacy._blur_roi(roi) for roi in rois]
+    mismatches = []
+    start = threading.Barrier(2)
+
+    def worker(idx):
+        start.wait()
+        for _ in range(150):
+            out = anonymizer._blur_roi(rois[idx]).copy()
+            if not np.array_equal(out, expected[idx]):
+                mismatches.append(idx)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in (0, 1)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not mismatches
@@ -0,0 +1,162 @@
+import numpy as np
+import cv2
+import pytest
+from loguru import logger
+from output import video_writer
+from output.video_writer import put_subtitle, write_video
+from tests.legacy_frame_loop import LegacyFaceAnonymizer, legacy_put_subtitle, legacy_write_video
+from utils.buffers import FramePool
+from video_processor.face_blur import FaceAnonymizer
+
+FACES = [(10, 10, 40, 40), (60, 30, 36, 50)]
+SEGMENTS = [{"start": 0.0, "end": 100.0, "text": "hello world"}]
+
+
+class _FixedFaces:
+    # Haar finds nothing in synthetic frames; still run detection, then blur fixed boxes
+    def detect_faces(self, frame):
+        super().detect_faces(frame)
+        return FACES
+
+
+class _FixedFaceAnonymizer(_FixedFaces, FaceAnonymizer):
+    pass
+
+
+class _FixedFaceLegacyAnonymizer(_FixedFaces, LegacyFaceAnonymizer):
+    pass
+
+
+def test_put_subtitle_matches_full_frame_overlay():
+    rng = np.random.default_rng(0)
+    # Default position plus boxes clipped by each frame edge (varying scratch sizes)
+    for pos in ((30, 40), (5, 10), (150, 115), (-20, 60), (30, 40)):
+        frame = rng.integers(0, 256, (120, 200, 3), dtype=np.uint8)
+        expected = legacy_put_subtitle(frame.copy(), "hello world", pos=pos, bg_color=(10, 20, 30))
+        out = put_subtitle(frame.copy(), "hello world", pos=pos, bg_color=(10, 20, 30))
+        assert np.array_equal(out, expected)
+
+
+def test_frame_pool_reuses_released_buffers():
+    pool = FramePool((4, 6, 3))
+    buf = pool.acquire()
+    pool.release(buf)
+    assert pool.acquire() is buf
+    extra = pool.acquire()
+    assert pool.misses == 1
+    assert not pool.owns(extra)  # temporaries from a miss never join the pool
+    pool.release(extra)
+    pool.release(np.empty((4, 6, 3), np.uint8))  # foreign buffers are not pooled
+    pool.release(buf)
+    pool.release(buf)  # double release must not hand the buffer out twice
+    assert pool.acquire() is buf
+    assert pool.acquire() is not buf
+    assert len(pool._owned) == 1
+
+
+def _write_input(path, n=5, size=(96, 256)):
+    rng = np.random.default_rng(0)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (size[1], size[0]))
+    for _ in range(n):
+        writer.write(rng.integers(0, 256, size + (3,), dtype=np.uint8))
+    writer.release()
+
+
+def _read_all(path):
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_write_video_matches_legacy_output(tmp_path):
+    src = tmp_path / "in.avi"
+    _write_input(src)
+
+    out = tmp_path / "out" / "anonymized.mp4"
+    write_video(str(src), str(out), _FixedFaceAnonymizer(), subtitle_segments=SEGMENTS)
+    # The legacy loop encodes the same way, so both sides see identical codec loss
+    ref = tmp_path / "ref.mp4"
+    legacy_write_video(str(src), str(ref), _FixedFaceLegacyAnonymizer(), subtitle_segments=SEGMENTS)
+
+    got, want = _read_all(out), _read_all(ref)
+    assert len(got) == len(want) == 5
+    assert all(np.array_equal(g, w) for g, w in zip(got, want))
+
+
+@pytest.mark.parametrize("reported", [(0, 0), (120, 80)])
+def test_write_video_handles_misreported_frame_size(tmp_path, monkeypatch, reported):
+    src = tmp_path / "in.avi"
+    _write_input(src)
+
+    real_capture = cv2.VideoCapture
+
+    class MisreportingCapture:
+        # Wraps rather than subclasses: GC of local cv2 subclasses can crash the interpreter
+        def __init__(self, *args):
+            self._cap = real_capture(*args)
+
+        def get(self, prop):
+            if prop == cv2.CAP_PROP_FRAME_WIDTH:
+                return reported[0]
+            if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+                return reported[1]
+            return self._cap.get(prop)
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+    written = {}
+
+    class RecordingWriter:
+        def __init__(self, path, *args):
+            self.frames = written.setdefault(path, [])
+
+        def write(self, frame):
+            self.frames.append(frame.copy())
+
+        def release(self):
+            pass
+
+    monkeypatch.setattr(cv2, "VideoCapture", MisreportingCapture)
+    monkeypatch.setattr(cv2, "VideoWriter", RecordingWriter)
+    out, ref = str(tmp_path / "out" / "x.mp4"), str(tmp_path / "ref.mp4")
+    messages = []
+    handler = logger.add(messages.append, level="WARNING")
+    try:
+        write_video(str(src), out, _FixedFaceAnonymizer(), subtitle_segments=SEGMENTS)
+    finally:
+        logger.remove(handler)
+    legacy_write_video(str(src), ref, _FixedFaceLegacyAnonymizer(), subtitle_segments=SEGMENTS)
+
+    # Pool is rebuilt once from the decoded shape, then every later frame is pooled
+    assert sum("resizing frame pool" in m for m in messages) == 1
+    assert len(written[out]) == len(written[ref]) == 5
+    assert all(np.array_equal(g, w) for g, w in zip(written[out], written[ref]))
+
+
+def test_write_video_releases_pool_buffer_when_anonymizer_copies(tmp_path, monkeypatch):
+    src = tmp_path / "in.avi"
+    _write_input(src)
+    pools = []
+
+    class RecordingPool(video_writer.FramePool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    class CopyingAnonymizer:
+        def anonymize(self, frame):
+            return frame.copy()
+
+    monkeypatch.setattr(video_writer, "FramePool", RecordingPool)
+    write_video(str(src), str(tmp_path / "out" / "x.mp4"), CopyingAnonymizer())
+
+    assert len(pools) == 1
+    assert pools[0].misses == 0
+    assert len(pools[0]._owned) == 1
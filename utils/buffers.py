@@ -0,0 +1,53 @@
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+import numpy as np
+
+
+class FramePool:
+    """Fixed set of preallocated frame buffers reused across decode/encode.
+
+    Buffers are handed out with ``acquire`` (e.g. as ``cap.read(image=...)``
+    targets) and handed back with ``release`` once the frame has been encoded.
+    When every buffer is checked out, ``acquire`` returns a temporary array that
+    the pool does not own, so a caller that never releases cannot grow the pool.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], size: int = 1, dtype=np.uint8):
+        if size < 1:
+            raise ValueError(f"Pool size must be >= 1, got {size}")
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        # Strong references to the pooled buffers, so ownership is checked by
+        # identity and never confused with an unrelated array reusing an id()
+        self._owned: List[np.ndarray] = [np.empty(self.shape, self.dtype) for _ in range(size)]
+        self._free: Deque[np.ndarray] = deque(self._owned)
+        self.misses = 0  # acquires that had to allocate a temporary because the pool was empty
+
+    def acquire(self) -> np.ndarray:
+        if self._free:
+            return self._free.popleft()
+        self.misses += 1
+        return np.empty(self.shape, self.dtype)
+
+    def owns(self, buf: np.ndarray) -> bool:
+        return any(b is buf for b in self._owned)
+
+    def release(self, buf: np.ndarray) -> None:
+        # Temporaries from a miss and foreign arrays are simply dropped
+        if self.owns(buf) and not any(b is buf for b in self._free):
+            self._free.append(buf)
+
+
+def scratch_view(buf: Optional[np.ndarray], shape: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(backing, view)`` where ``view`` is a contiguous ``shape`` view of ``backing``.
+
+    ``backing`` is a flat buffer that only grows when ``shape`` needs more room,
+    so varying ROI sizes share one allocation.
+    """
+    n = int(np.prod(shape))
+    if buf is None or buf.size < n:
+        buf = np.empty(n, np.uint8)
+    return buf, buf[:n].reshape(shape)
+
+
+__all__ = ["FramePool", "scratch_view"]
@@ -1,9 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Tuple, Literal, List
+import threading
 import cv2
 import numpy as np
 from loguru import logger
 
+from utils.buffers import scratch_view
+
 BlurMethod = Literal["gaussian", "pixelate"]
 
 
@@ -17,6 +20,9 @@ class FaceAnonymizer:
     scale_factor: float = 1.1
     min_neighbors: int = 5
     min_size: Tuple[int, int] = (30, 30)
+    # Scratch buffers reused across frames, kept per thread so one instance can
+    # serve several streams (e.g. the Streamlit app's shared cached anonymizer)
+    _scratch: threading.local = field(default_factory=threading.local, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.detector = cv2.CascadeClassifier(self.cascade_path)
@@ -25,7 +31,10 @@ class FaceAnonymizer:
         logger.info(f"Loaded Haar cascade from {self.cascade_path}")
 
     def detect_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = getattr(self._scratch, "gray", None)
+        if gray is None or gray.shape != frame.shape[:2]:
+            gray = self._scratch.gray = np.empty(frame.shape[:2], np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
         rects = self.detector.detectMultiScale(
             gray,
             scaleFactor=self.scale_factor,
@@ -36,14 +45,21 @@ class FaceAnonymizer:
         return [(x, y, w, h) for (x, y, w, h) in rects]
 
     def _blur_roi(self, roi: np.ndarray) -> np.ndarray:
+        # Result is a view into this thread's scratch buffer; it is overwritten by the next call
+        scratch = self._scratch
+        scratch.roi_buf, out = scratch_view(getattr(scratch, "roi_buf", None), roi.shape)
         if self.blur_method == "gaussian":
-            return cv2.GaussianBlur(roi, self.gaussian_kernel, self.gaussian_sigma)
+            return cv2.GaussianBlur(roi, self.gaussian_kernel, self.gaussian_sigma, dst=out)
         elif self.blur_method == "pixelate":
             h, w = roi.shape[:2]
             x_blocks = max(1, self.pixelate_blocks)
+            y_blocks = max(1, int(x_blocks * h / w))
             # downscale then upscale to pixelate
-            roi_small = cv2.resize(roi, (x_blocks, max(1, int(x_blocks * h / w))), interpolation=cv2.INTER_LINEAR)
-            return cv2.resize(roi_small, (w, h), interpolation=cv2.INTER_NEAREST)
+            scratch.small_buf, roi_small = scratch_view(
+                getattr(scratch, "small_buf", None), (y_blocks, x_blocks) + roi.shape[2:]
+            )
+            cv2.resize(roi, (x_blocks, y_blocks), dst=roi_small, interpolation=cv2.INTER_LINEAR)
+            return cv2.resize(roi_small, (w, h), dst=out, interpolation=cv2.INTER_NEAREST)
         else:
             raise ValueError(f"Unknown blur method: {self.blur_method}")
 
@@ -51,5 +67,5 @@ class FaceAnonymizer:
         faces = self.detect_faces(frame)
         for (x, y, w, h) in faces:
             roi = frame[y : y + h, x : x + w]
-            frame[y : y + h, x : x + w] = self._blur_roi(roi)
+            np.copyto(roi, self._blur_roi(roi))
         return frame